@@ -2,10 +2,12 @@ import os
 import time
 import hashlib
 import argparse
+import mmap
 import random
-from multiprocessing import Process, Value, Lock, Event
-from Crypto.Hash import RIPEMD160, SHA256
-from coincurve import PrivateKey
+import struct
+import numpy as np
+from multiprocessing import Process, Value, RawArray, Event
+from coincurve import PublicKey
 
 # Define secp256k1 order for the private key range
 SECP256K1_ORDER = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364140", 16)
@@ -13,61 +15,197 @@ SECP256K1_ORDER = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD
 # Generation threshold for range shuffling
 RANGE_SHUFFLE_THRESHOLD = 68719476736
 
+# Keys a worker counts locally before publishing its running total to its counter slot
+COUNTER_FLUSH_INTERVAL = 4096
+
+# Each worker owns one uint64 slot every 8 entries of the shared counter array (one 64-byte cache line apart),
+# so it is the only writer of its slot and no two workers ever write the same cache line
+COUNTER_STRIDE = 8
+
+# Bytes fetched per os.urandom call when generating random private keys
+RANDOM_BUFFER_SIZE = 1 << 20
+
+# OpenSSL-backed SHA-256; OpenSSL selects its SHA-NI code path at runtime when the CPU has it
+sha256 = hashlib.sha256
+
+# Pre-initialized RIPEMD-160 state; copying it skips OpenSSL's per-call digest lookup and setup
+RIPEMD160_INITIAL = hashlib.new('ripemd160')
+
+# Target lists up to this size are checked with a plain frozenset, which is cheaper per key than the bloom path
+HOT_TARGET_LIMIT = 1 << 20
+
+# Bloom filter sizing for the target lookup (bits, rounded up to a power of two)
+BLOOM_MIN_BITS = 1 << 23
+BLOOM_BITS_PER_TARGET = 16
+
+# Targets processed per slice when scanning a (possibly memory-mapped) target array, so the
+# temporaries stay a few MB however large the target file is
+TARGET_SCAN_CHUNK = 1 << 16
+
+# RIPEMD-160 digests are already uniform, so their first three 32-bit words serve as the bloom probes
+bloom_probes = struct.Struct('<III').unpack_from
+
+# Endless stream of random 32-byte private keys sliced from a buffer refilled from os.urandom
+def random_private_keys():
+    while True:
+        buffer = os.urandom(RANDOM_BUFFER_SIZE)
+        for position in range(0, RANDOM_BUFFER_SIZE, 32):
+            yield buffer[position:position + 32]
+
 # Private key generation function
-def generate_private_key(random_mode=True, sequence=None, start_key=1, end_key=SECP256K1_ORDER):
+def generate_private_key(random_mode=True, sequence=None, start_key=1, end_key=SECP256K1_ORDER, random_keys=None):
     if random_mode:
-        return os.urandom(32)
+        return next(random_keys) if random_keys is not None else os.urandom(32)
     elif sequence is not None:
         return (start_key + sequence).to_bytes(32, 'big')
     else:
         raise ValueError("Specify a valid mode for private key generation")
 
-# RIPEMD-160 hash function for compressed and uncompressed keys
-def private_key_to_ripemd160(private_key):
-    priv_key_obj = PrivateKey(private_key)
-    public_key = priv_key_obj.public_key.format(compressed=True)
-    uncompressed_key = priv_key_obj.public_key.format(compressed=False)
-
-    sha256_hash_compressed = SHA256.new(public_key).digest()
-    sha256_hash_uncompressed = SHA256.new(uncompressed_key).digest()
+# HASH160: RIPEMD-160 of the SHA-256 digest of data
+def hash160(data):
+    h = RIPEMD160_INITIAL.copy()
+    h.update(sha256(data).digest())
+    return h.digest()
 
-    ripemd160_compressed = RIPEMD160.new(sha256_hash_compressed).digest()
-    ripemd160_uncompressed = RIPEMD160.new(sha256_hash_uncompressed).digest()
+# RIPEMD-160 hash function for compressed and uncompressed keys
+def public_key_to_ripemd160(public_key_obj):
+    # Serialize the point once; the compressed form is the parity prefix of y plus the x bytes
+    uncompressed_key = public_key_obj.format(compressed=False)
+    public_key = (b'\x03' if uncompressed_key[64] & 1 else b'\x02') + uncompressed_key[1:33]
 
-    return ripemd160_compressed, ripemd160_uncompressed
+    return hash160(public_key), hash160(uncompressed_key)
 
-# Target hash loading function
+# Target hash loading function: hex lines become a sorted array of raw 20-byte hashes
 def load_targets(file_path):
-    targets = set()
+    hashes = bytearray()
     try:
         with open(file_path, 'r') as f:
             for line in f:
-                targets.add(line.strip())
+                try:
+                    target = bytes.fromhex(line.strip())
+                except ValueError:
+                    continue
+                if len(target) == 20:
+                    hashes += target
+    except FileNotFoundError:
+        print(f"Error: Target file '{file_path}' not found.")
+    return np.sort(np.frombuffer(bytes(hashes), dtype='S20'))
+
+# Sortedness check done slice by slice; each slice overlaps the next by one record so no boundary is skipped
+def targets_sorted(targets):
+    for offset in range(0, len(targets), TARGET_SCAN_CHUNK):
+        chunk = targets[offset:offset + TARGET_SCAN_CHUNK + 1]
+        if not (chunk[:-1] <= chunk[1:]).all():
+            return False
+    return True
+
+# Binary target loading function: raw 20-byte records are memory-mapped, and a file that is
+# already sorted is searched in place so the OS page cache decides what stays resident
+def load_binary_targets(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size // 20 * 20
+            if size == 0:
+                return np.empty(0, dtype='S20')
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
     except FileNotFoundError:
         print(f"Error: Target file '{file_path}' not found.")
+        return np.empty(0, dtype='S20')
+    targets = np.frombuffer(mapped, dtype='S20')
+    if not targets_sorted(targets):
+        print(f"Target file '{file_path}' is not sorted; sorting a copy in memory.")
+        targets = np.sort(targets)
     return targets
 
+# Bloom filter over the sorted targets, returned as (bit array, probe mask)
+def build_bloom(targets):
+    bits = BLOOM_MIN_BITS
+    while bits < len(targets) * BLOOM_BITS_PER_TARGET and bits < 1 << 32:
+        bits <<= 1
+    bloom = np.zeros(bits // 8, dtype=np.uint8)
+    # Set the probe bits one slice of targets at a time instead of materializing every probe at once
+    for offset in range(0, len(targets), TARGET_SCAN_CHUNK):
+        probes = targets[offset:offset + TARGET_SCAN_CHUNK].view('<u4').reshape(-1, 5)[:, :3].ravel() & np.uint32(bits - 1)
+        np.bitwise_or.at(bloom, probes >> 3, np.left_shift(1, probes & 7).astype(np.uint8))
+    return bytes(bloom), bits - 1
+
+# Target membership test: bloom filter first, binary search of the sorted targets only on a bloom hit
+def is_target(ripemd_hash, bloom, bloom_mask, targets):
+    for probe in bloom_probes(ripemd_hash):
+        probe &= bloom_mask
+        if not bloom[probe >> 3] & (1 << (probe & 7)):
+            return False
+    index = targets.searchsorted(ripemd_hash)
+    return index < len(targets) and targets[index:index + 1].tobytes() == ripemd_hash
+
 # Worker function for each kangaroo
-def scan_worker(start, step, targets, random_mode, sequence_scan, start_key, end_key, stop_event, generated_count, lock, found_file, kangaroo_id, loop_count, matches_found):
+def scan_worker(start, step, targets, hot_targets, bloom, bloom_mask, random_mode, random_walk, sequence_scan, start_key, end_key, stop_event, counters, found_file, kangaroo_id, loop_count, matches_found):
     sequence = start if sequence_scan else None
     local_generation_count = 0
+    unflushed_count = 0
+    generated_total = 0
+    counter_slot = (kangaroo_id - 1) * COUNTER_STRIDE
+    # Pin each kangaroo to its own CPU (round-robin over the CPUs we may run on) so the scheduler
+    # does not migrate it and its caches between cores; skipped where affinity is not supported
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[(kangaroo_id - 1) % len(cpus)]})
+    random_keys = random_private_keys() if random_mode else None
+    walk_remaining = 0
+    # One O_APPEND descriptor per worker: each match is a single atomic append, even with other workers writing
+    found_fd = os.open(found_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    if hot_targets is not None:
+        is_match = hot_targets.__contains__
+    else:
+        is_match = lambda ripemd_hash: is_target(ripemd_hash, bloom, bloom_mask, targets)
+    # Sequential keys differ by +/-1, so their public points differ by +/-G: walk the point with
+    # one addition per key and only do a full scalar multiplication when the walk (re)starts
+    # (SECP256K1_ORDER is n - 1, the largest valid key, so reduce the step modulo n)
+    step_point = PublicKey.from_secret((step % (SECP256K1_ORDER + 1)).to_bytes(32, 'big'))
+    public_key = None
     while not stop_event.is_set():
         if sequence is not None and (sequence < start_key if step < 0 else sequence > end_key):
             with loop_count.get_lock():
                 loop_count.value += 1
             sequence = start
+            # Restart the point walk: a random walk draws a fresh base, a sequence walk re-derives its start
+            public_key = None
+            walk_remaining = 0
 
-        private_key = generate_private_key(random_mode=random_mode, sequence=sequence, start_key=start_key, end_key=end_key)
-        compressed, uncompressed = private_key_to_ripemd160(private_key)
+        if random_mode:
+            # Each random base is followed by random_walk - 1 neighbouring keys reached by point addition
+            if walk_remaining == 0:
+                private_key = generate_private_key(random_mode=True, random_keys=random_keys)
+                public_key = PublicKey.from_secret(private_key)
+                walk_key = int.from_bytes(private_key, 'big')
+                walk_remaining = random_walk
+            else:
+                private_key = None
+                public_key = PublicKey.combine_keys([public_key, step_point])
+                walk_key += step
+            walk_remaining -= 1
+        else:
+            # The sequence key is only serialized to (re)start the walk or to report a match
+            private_key = None
+            if public_key is None:
+                public_key = PublicKey.from_secret(generate_private_key(random_mode=False, sequence=sequence, start_key=start_key, end_key=end_key))
+            else:
+                public_key = PublicKey.combine_keys([public_key, step_point])
+        compressed, uncompressed = public_key_to_ripemd160(public_key)
 
-        with lock:
-            generated_count.value += 1
-            local_generation_count += 1
+        local_generation_count += 1
+        unflushed_count += 1
+        if unflushed_count == COUNTER_FLUSH_INTERVAL:
+            generated_total += unflushed_count
+            counters[counter_slot] = generated_total
+            unflushed_count = 0
 
         # Check if the generated hashes match any target
-        if compressed.hex() in targets or uncompressed.hex() in targets:
-            with open(found_file, 'a') as f:
-                f.write(f"Kangaroo {kangaroo_id} found key:\nPrivate Key: {private_key.hex()}\nRIPEMD-160 Hash: {compressed.hex() if compressed.hex() in targets else uncompressed.hex()}\n\n")
+        compressed_match = is_match(compressed)
+        if compressed_match or is_match(uncompressed):
+            if private_key is None:
+                private_key = walk_key.to_bytes(32, 'big') if random_mode else generate_private_key(random_mode=False, sequence=sequence, start_key=start_key, end_key=end_key)
+            os.write(found_fd, f"Kangaroo {kangaroo_id} found key:\nPrivate Key: {private_key.hex()}\nRIPEMD-160 Hash: {(compressed if compressed_match else uncompressed).hex()}\n\n".encode())
             with matches_found.get_lock():
                 matches_found.value += 1
 
@@ -77,35 +215,52 @@ def scan_worker(start, step, targets, random_mode, sequence_scan, start_key, end
             process_end = min(process_start + (end_key - start_key) // 10, end_key)
             print(f"\n[Range Shuffle] Launching K{kangaroo_id} to new range :: {{ {hex(process_start)} : {hex(process_end)} }}")
             sequence = process_start if sequence_scan else None
+            public_key = None
+            walk_remaining = 0
             local_generation_count = 0  # Reset local count after shuffling
 
-        sequence += step
+        if sequence is not None:
+            sequence += step
+
+    counters[counter_slot] = generated_total + unflushed_count
+    os.close(found_fd)
 
 # Statistics display function
-def display_statistics(generated_count, start_time, stop_event, kangaroo_count, loop_count, matches_found):
+def display_statistics(counters, start_time, stop_event, kangaroo_count, loop_count, matches_found):
     while not stop_event.is_set():
         time.sleep(1)
-        elapsed_time = time.time() - start_time
-        with generated_count.get_lock(), loop_count.get_lock(), matches_found.get_lock():
-            total_keys = generated_count.value
-            loop = loop_count.value
-            matches = matches_found.value
+        elapsed_time = time.monotonic() - start_time
+        # Display-only reads: aligned loads of single-writer counters need no lock, and a value one flush behind is fine
+        total_keys = sum(counters[::COUNTER_STRIDE])
+        # .value on a synchronized Value takes its lock, so read the underlying ctypes object instead
+        loop = loop_count.get_obj().value
+        matches = matches_found.get_obj().value
         keys_per_second = total_keys / elapsed_time if elapsed_time > 0 else 0
         print(f"\r[+ Total keys generated: {total_keys}][Speed: {keys_per_second:.2f} Keys/s][Kangaroos launched: {kangaroo_count}][Loop: {loop}][Matches found: {matches}]", end="", flush=True)
 
 # Main function to launch kangaroo workers
-def scan_keys(targets, random_mode, sequence_scan, reverse, kangaroo_count, start_key, end_key, found_file):
-    generated_count = Value('i', 0)
+def scan_keys(targets, random_mode, random_walk, sequence_scan, reverse, kangaroo_count, start_key, end_key, found_file):
+    counters = RawArray('Q', kangaroo_count * COUNTER_STRIDE)
     loop_count = Value('i', 0)
     matches_found = Value('i', 0)
-    lock = Lock()
     stop_event = Event()
 
+    if len(targets) <= HOT_TARGET_LIMIT:
+        raw_targets = targets.tobytes()
+        hot_targets = frozenset(raw_targets[i:i + 20] for i in range(0, len(raw_targets), 20))
+        # Workers only use the sorted array on the bloom path, so do not hand it to them here
+        targets, bloom, bloom_mask = None, None, 0
+    else:
+        hot_targets = None
+        # The (possibly memory-mapped) array and the bloom are shared with the workers without a copy
+        # only when they are forked; spawn and forkserver pickle both into every worker
+        bloom, bloom_mask = build_bloom(targets)
+
     step = -1 if reverse else 1
     range_step = (end_key - start_key) // kangaroo_count
-    start_time = time.time()
+    start_time = time.monotonic()
 
-    stats_process = Process(target=display_statistics, args=(generated_count, start_time, stop_event, kangaroo_count, loop_count, matches_found))
+    stats_process = Process(target=display_statistics, args=(counters, start_time, stop_event, kangaroo_count, loop_count, matches_found))
     stats_process.start()
 
     process_list = []
@@ -116,7 +271,7 @@ def scan_keys(targets, random_mode, sequence_scan, reverse, kangaroo_count, star
 
         process = Process(
             target=scan_worker,
-            args=(process_start, step, targets, random_mode, sequence_scan, start_key, end_key, stop_event, generated_count, lock, found_file, i + 1, loop_count, matches_found)
+            args=(process_start, step, targets, hot_targets, bloom, bloom_mask, random_mode, random_walk, sequence_scan, start_key, end_key, stop_event, counters, found_file, i + 1, loop_count, matches_found)
         )
         process.daemon = True
         process.start()
@@ -127,13 +282,15 @@ def scan_keys(targets, random_mode, sequence_scan, reverse, kangaroo_count, star
 
     stop_event.set()
     stats_process.join()
-    print(f"\nFinal total keys generated: {generated_count.value}")
+    print(f"\nFinal total keys generated: {sum(counters[::COUNTER_STRIDE])}")
 
 # Main entry point with argument parsing
 def main():
     parser = argparse.ArgumentParser(description="Kangaroo algorithm with RIPEMD-160 hash matching.")
     parser.add_argument('-f', '--file', type=str, required=True, help="Path to the file containing target RIPEMD-160 hashes")
+    parser.add_argument('-b', '--binary', action='store_true', help="Target file holds raw 20-byte RIPEMD-160 records (memory-mapped; keep it sorted to avoid an in-memory copy)")
     parser.add_argument('-R', '--random', action='store_true', help="Enable random mode for private key generation")
+    parser.add_argument('-w', '--walk', type=int, default=1, help="Random mode: keys scanned sequentially from each random base key")
     parser.add_argument('-S', '--sequence', action='store_true', help="Enable sequence mode for private key generation")
     parser.add_argument('-k', '--kangaroos', type=int, default=1, help="Number of kangaroos to launch within the range")
     parser.add_argument('-s', '--start', type=int, default=1, help="Starting key for sequential scan")
@@ -143,14 +300,15 @@ def main():
 
     args = parser.parse_args()
 
-    targets = load_targets(args.file)
-    if not targets:
+    targets = load_binary_targets(args.file) if args.binary else load_targets(args.file)
+    if len(targets) == 0:
         print("No targets loaded. Exiting.")
         return
 
     scan_keys(
         targets=targets,
         random_mode=args.random,
+        random_walk=max(args.walk, 1),
         sequence_scan=args.sequence,
         reverse=args.reverse,
         kangaroo_count=args.kangaroos,
@@ -1,17 +1,37 @@
 import os
 import time
 import hashlib
-from ecdsa import SECP256k1, SigningKey
-from multiprocessing import Process, Value, Lock, Event, cpu_count
+from coincurve import PublicKey
+from multiprocessing import Process, RawArray, Lock, Event, cpu_count
 import argparse
 
-SECP256K1_ORDER = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364140", 16)
+SECP256K1_ORDER = int("FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141", 16)
+
+# Keys a worker counts locally before publishing its running total to the shared counters
+COUNTER_FLUSH_INTERVAL = 4096
+
+# Each worker owns one uint64 slot every 8 entries of the shared counter array (one 64-byte cache line apart),
+# so it is the only writer of its slot and no two workers ever write the same cache line
+COUNTER_STRIDE = 8
+
+# Hash constructors bound once: sha256 skips the module attribute lookup, and RIPEMD-160 is copied
+# from an initialized state instead of being looked up by name on every call
+sha256 = hashlib.sha256
+RIPEMD160_INITIAL = hashlib.new('ripemd160')
 
 def load_targets(file_path):
-    """Load target RIPEMD-160 hashes from a file."""
+    """Load target RIPEMD-160 hashes from a file as raw 20-byte digests, skipping lines that are not one."""
+    targets = set()
     try:
         with open(file_path, 'r') as f:
-            return set(line.strip() for line in f if line.strip())
+            for line in f:
+                try:
+                    target = bytes.fromhex(line.strip())
+                except ValueError:
+                    continue
+                if len(target) == 20:
+                    targets.add(target)
+        return frozenset(targets)
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
         exit(1)
@@ -22,88 +42,115 @@ def save_match(private_key, hash_value):
         f.write(f"Private Key: {private_key.hex()}\nRIPEMD-160 Hash: {hash_value}\n\n")
 
 def generate_jump_table(size=100):
-    """Generate jump table for the kangaroo algorithm with random steps."""
-    return [os.urandom(32) for _ in range(size)]
-
-def private_key_to_ripemd160(private_key):
-    """Convert a private key to its RIPEMD-160 hash (both compressed and uncompressed)."""
-    signing_key = SigningKey.from_string(private_key, curve=SECP256k1)
-    public_key = signing_key.verifying_key.to_string()
-
-    # Compress the public key based on y-coordinate parity
-    compressed_key = b'\x02' + public_key[:32] if public_key[32] % 2 == 0 else b'\x03' + public_key[:32]
+    """Generate jump table for the kangaroo algorithm with random steps, decoded to integers once up front."""
+    return [int.from_bytes(os.urandom(32), 'big') for _ in range(size)]
+
+def hash160(data):
+    """RIPEMD-160 of the SHA-256 digest of data."""
+    h = RIPEMD160_INITIAL.copy()
+    h.update(sha256(data).digest())
+    return h.digest()
+
+def generate_jump_points(jump_table):
+    """Precompute the jump points step*G once, serialized uncompressed so every worker can load them without a scalar multiplication."""
+    return [PublicKey.from_secret((step % SECP256K1_ORDER).to_bytes(32, 'big')).format(compressed=False) for step in jump_table]
+
+def public_key_to_ripemd160(public_point):
+    """Convert a public key to its RIPEMD-160 hash (both compressed and uncompressed)."""
+    # Serialize the libsecp256k1 public key once as raw x||y and build both encodings from it
+    public_key = public_point.format(compressed=False)[1:]
+
+    # Compress the public key based on y-coordinate parity (the last byte of y)
+    compressed_key = b'\x02' + public_key[:32] if public_key[63] % 2 == 0 else b'\x03' + public_key[:32]
     uncompressed_key = b'\x04' + public_key
 
-    ripemd160_compressed = hashlib.new('ripemd160', hashlib.sha256(compressed_key).digest()).digest()
-    ripemd160_uncompressed = hashlib.new('ripemd160', hashlib.sha256(uncompressed_key).digest()).digest()
+    ripemd160_compressed = hash160(compressed_key)
+    ripemd160_uncompressed = hash160(uncompressed_key)
 
-    return ripemd160_compressed.hex(), ripemd160_uncompressed.hex()
+    return ripemd160_compressed, ripemd160_uncompressed
 
 def kangaroo_jump(private_key, jump_table, index):
-    """Perform a kangaroo jump based on the jump table at a given index."""
-    step = int.from_bytes(jump_table[index % len(jump_table)], 'big')
-    new_key = (int.from_bytes(private_key, 'big') + step) % SECP256K1_ORDER
-    return new_key.to_bytes(32, 'big')
+    """Perform a kangaroo jump based on the jump table at a given index, on the integer private key."""
+    step = jump_table[index % len(jump_table)]
+    return (private_key + step) % SECP256K1_ORDER
 
-def scan_worker(start_key, end_key, targets, jump_table, stop_event, generated_count, lock):
+def scan_worker(start_key, end_key, targets, jump_table, jump_points, stop_event, counters, worker_id, lock):
     """Worker function to generate and check private keys using kangaroo jumps within a specified range."""
     current_key = start_key
     jump_index = 0
-
-    while int.from_bytes(current_key, 'big') < int.from_bytes(end_key, 'big') and not stop_event.is_set():
-        compressed, uncompressed = private_key_to_ripemd160(current_key)
+    local_count = 0
+    generated_total = 0
+    counter_slot = worker_id * COUNTER_STRIDE
+    # The walk carries its public point along: each jump adds step*G with one point addition
+    # instead of re-deriving the point from the new private key
+    jump_points = [PublicKey(point) for point in jump_points]
+    current_point = PublicKey.from_secret(current_key.to_bytes(32, 'big'))
+
+    # The key stays an integer for the whole walk; it is only encoded to bytes when a match is reported
+    while current_key < end_key and not stop_event.is_set():
+        compressed, uncompressed = public_key_to_ripemd160(current_point)
 
         # Check if either hash matches the target
         if compressed in targets or uncompressed in targets:
+            matched_hash = (compressed if compressed in targets else uncompressed).hex()
+            private_key = current_key.to_bytes(32, 'big')
             with lock:
-                print(f"\nMatch found!\nPrivate Key: {current_key.hex()}\nRIPEMD-160 Hash: {compressed if compressed in targets else uncompressed}")
-            save_match(current_key, compressed if compressed in targets else uncompressed)
+                print(f"\nMatch found!\nPrivate Key: {private_key.hex()}\nRIPEMD-160 Hash: {matched_hash}")
+            save_match(private_key, matched_hash)
             stop_event.set()
             break
 
         # Perform kangaroo jump and update state
         current_key = kangaroo_jump(current_key, jump_table, jump_index)
+        current_point = PublicKey.combine_keys([current_point, jump_points[jump_index % len(jump_points)]])
         jump_index += 1
 
-        # Increment generated count
-        with lock:
-            generated_count.value += 1
+        # Increment generated count locally and publish the running total in batches
+        local_count += 1
+        if local_count == COUNTER_FLUSH_INTERVAL:
+            generated_total += local_count
+            counters[counter_slot] = generated_total
+            local_count = 0
+
+    counters[counter_slot] = generated_total + local_count
 
-def display_statistics(generated_count, start_time, stop_event):
+def display_statistics(counters, start_time, stop_event):
     """Display statistics such as total keys generated and generation speed."""
     while not stop_event.is_set():
         time.sleep(1)
-        elapsed_time = time.time() - start_time
-        with generated_count.get_lock():
-            total_keys = generated_count.value
+        elapsed_time = time.monotonic() - start_time
+        # Display-only read of the RawArray slots: aligned loads of single-writer counters need no lock,
+        # and a total one flush behind only delays the display
+        total_keys = sum(counters[::COUNTER_STRIDE])
         keys_per_second = total_keys / elapsed_time if elapsed_time > 0 else 0
         print(f"\r[Total keys generated: {total_keys}][Speed: {keys_per_second:.2f} Keys/s]", end="", flush=True)
 
 def scan_keys(target_file, start_key, end_key):
     """Main function to start the kangaroo algorithm across multiple processes within specified key ranges."""
     targets = load_targets(target_file)
-    generated_count = Value('i', 0)
+    num_workers = cpu_count()
+    counters = RawArray('Q', num_workers * COUNTER_STRIDE)
     lock = Lock()
     stop_event = Event()
     jump_table = generate_jump_table(size=100)
-    num_workers = cpu_count()
+    jump_points = generate_jump_points(jump_table)
 
     # Calculate ranges for each worker
     ranges = [(start_key + i * (end_key - start_key) // num_workers, start_key + (i + 1) * (end_key - start_key) // num_workers)
               for i in range(num_workers)]
     
-    start_time = time.time()
+    start_time = time.monotonic()
 
     # Statistics process
-    stats_process = Process(target=display_statistics, args=(generated_count, start_time, stop_event))
+    stats_process = Process(target=display_statistics, args=(counters, start_time, stop_event))
     stats_process.start()
 
     # Launch worker processes for parallel scanning within specified ranges
     process_list = []
-    for range_start, range_end in ranges:
+    for worker_id, (range_start, range_end) in enumerate(ranges):
         process = Process(
             target=scan_worker,
-            args=(range_start.to_bytes(32, 'big'), range_end.to_bytes(32, 'big'), targets, jump_table, stop_event, generated_count, lock)
+            args=(range_start, range_end, targets, jump_table, jump_points, stop_event, counters, worker_id, lock)
         )
         process.daemon = True
         process.start()
@@ -116,7 +163,7 @@ def scan_keys(target_file, start_key, end_key):
     # Stop the statistics process and print final count
     stop_event.set()
     stats_process.join()
-    print(f"\nFinal total keys generated: {generated_count.value}")
+    print(f"\nFinal total keys generated: {sum(counters[::COUNTER_STRIDE])}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Kangaroo Algorithm for Private Key Search")
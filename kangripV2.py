@@ -4,14 +4,22 @@ import time
 import os
 import signal
 import sys
-from Crypto.Hash import RIPEMD160, SHA256
-from coincurve import PrivateKey
+import hashlib
+from coincurve._libsecp256k1 import ffi, lib
+from coincurve.context import GLOBAL_CONTEXT
 import numpy as np
-import secrets
 import random
 
 # Constants for secp256k1 curve
-CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Target files up to this many digests are loaded into a frozenset; larger ones stay a sorted array
+# of raw 20-byte records (20 bytes per target instead of ~100) searched with np.searchsorted
+HOT_TARGET_LIMIT = 1 << 20
+
+# Candidates processed per worker task, and how many are drawn from the CSPRNG at once
+WORKER_ITERATIONS = 10000
+CANDIDATE_BLOCK = 1000
 
 # Signal handler for graceful shutdown
 def signal_handler(sig, frame):
@@ -21,41 +29,102 @@ def signal_handler(sig, frame):
 # Registering signal to handle keyboard interrupts
 signal.signal(signal.SIGINT, signal_handler)
 
-# RIPEMD-160 hashing function using PyCryptodome
-def ripemd160(data):
-    h = RIPEMD160.new()
-    h.update(data)
+# OpenSSL-backed SHA-256, bound once so hash160 skips the module attribute lookup
+sha256 = hashlib.sha256
+
+# Pre-initialized RIPEMD-160 state; copying it skips OpenSSL's per-call digest lookup and setup
+RIPEMD160_INITIAL = hashlib.new('ripemd160')
+
+# HASH160: RIPEMD-160 of the SHA-256 digest of data
+def hash160(data):
+    h = RIPEMD160_INITIAL.copy()
+    h.update(sha256(data).digest())
     return h.digest()
 
-# Function to generate secure random numbers within a specific range
-def generate_random_in_range(start, end):
+# Function to generate a block of secure random numbers within a specific range from batched os.urandom calls
+# (rejection sampling on the masked value keeps every candidate uniform over the range; each further call
+# refills all rejected slots at once)
+def generate_random_block_in_range(start, end, count):
     range_size = end - start
-    return start + secrets.randbelow(range_size)
+    if range_size <= 0:
+        raise ValueError("Range end must be greater than range start")
+    bits = range_size.bit_length()
+    width = (bits + 7) // 8
+    mask = (1 << bits) - 1
+    block = []
+    while len(block) < count:
+        raw = os.urandom(width * (count - len(block)))
+        for offset in range(0, len(raw), width):
+            value = int.from_bytes(raw[offset:offset + width], 'big') & mask
+            if value < range_size:
+                block.append(start + value)
+    return block
+
+# Target loading function: small files become a frozenset of raw digests, large ones a sorted S20 array
+def load_targets(file_path):
+    # Truncate to a multiple of 20 bytes to match RIPEMD-160 hashes
+    count = os.path.getsize(file_path) // 20
+    if count <= HOT_TARGET_LIMIT:
+        with open(file_path, 'rb') as f:
+            file_content = f.read(count * 20)
+        return frozenset(file_content[i:i + 20] for i in range(0, count * 20, 20))
+    targets = np.fromfile(file_path, dtype='S20', count=count)
+    targets.sort()
+    return targets
+
+# Binary search of the sorted target array; compare raw bytes since S20 elements drop trailing NUL bytes
+def is_target(ripemd_hash, targets):
+    index = targets.searchsorted(ripemd_hash)
+    return index < len(targets) and targets[index:index + 1].tobytes() == ripemd_hash
+
+# Targets of the current worker process, installed once by init_worker
+worker_targets = frozenset()
+
+# Pool initializer: with fork the targets are inherited rather than pickled into every task
+def init_worker(targets):
+    global worker_targets
+    worker_targets = targets
 
 # Kangaroo worker function for parallel processing
-def kangaroo_worker(start_range, end_range, target_ripemd_list):
+def kangaroo_worker(start_range, end_range):
     found_keys = []
-    for _ in range(10000):  # Adjust iterations for batch processing if needed
-        candidate = generate_random_in_range(start_range, end_range)
-        
-        if candidate >= CURVE_ORDER:
-            continue
+    # Pick the membership test once: set lookup for small target lists, binary search for large ones
+    targets = worker_targets
+    if isinstance(targets, frozenset):
+        is_match = targets.__contains__
+    else:
+        is_match = lambda ripemd_hash: is_target(ripemd_hash, targets)
+    # Bind the hashing and sampling helpers to locals so the loop skips their global lookups
+    hash_160 = hash160
+    random_block_in_range = generate_random_block_in_range
+    # Call libsecp256k1 directly with reused output buffers instead of building PrivateKey/PublicKey objects per key
+    ctx = GLOBAL_CONTEXT.ctx
+    pubkey_create = lib.secp256k1_ec_pubkey_create
+    pubkey_serialize = lib.secp256k1_ec_pubkey_serialize
+    compressed_flag = lib.SECP256K1_EC_COMPRESSED
+    pubkey = ffi.new('secp256k1_pubkey *')
+    pub_out = ffi.new('unsigned char[33]')
+    pub_len = ffi.new('size_t *', 33)
+    pub_key = ffi.buffer(pub_out)
+    # Work in blocks: draw all candidates of a block first, then run each through derive -> hash -> check
+    for _ in range(WORKER_ITERATIONS // CANDIDATE_BLOCK):
+        for candidate in random_block_in_range(start_range, end_range, CANDIDATE_BLOCK):
+            # Out-of-range keys are rejected up front instead of raising inside the loop
+            if not 0 < candidate < CURVE_ORDER:
+                continue
 
-        try:
             # Generate private key
-            priv_key = PrivateKey(candidate.to_bytes(32, 'big'))
-            # Derive the public key in compressed format
-            pub_key = priv_key.public_key.format(compressed=True)
+            priv_key = candidate.to_bytes(32, 'big')
+            # Derive the public key in compressed format into pub_out
+            pubkey_create(ctx, pubkey, priv_key)
+            pubkey_serialize(ctx, pub_out, pub_len, pubkey, compressed_flag)
 
             # Generate RIPEMD-160 hash of the public key
-            sha256_hash = SHA256.new(pub_key).digest()
-            ripemd_hash = ripemd160(sha256_hash)
+            ripemd_hash = hash_160(pub_key)
 
             # Check if hash is in target list
-            if ripemd_hash in target_ripemd_list:
-                found_keys.append((priv_key.to_hex(), ripemd_hash.hex()))
-        except Exception as e:
-            print(f"Error with key {hex(candidate)}: {e}")
+            if is_match(ripemd_hash):
+                found_keys.append((priv_key.hex(), ripemd_hash.hex()))
     return found_keys
 
 # Main function to handle arguments, file loading, and parallel execution
@@ -70,11 +139,8 @@ def main():
     start_range, end_range = map(lambda x: int(x, 16), args.range.split(":"))
     max_workers = min(args.threads, os.cpu_count())
 
-    # Load target RIPEMD-160 hashes from file into a numpy array for efficient lookups
-    with open(args.file, 'rb') as f:
-        file_content = f.read()
-        adjusted_size = (len(file_content) // 20) * 20
-        target_ripemd_list = np.frombuffer(file_content[:adjusted_size], dtype='S20')
+    # Load target RIPEMD-160 hashes: a frozenset for O(1) lookups, or a sorted array once the file is too large for one
+    targets = load_targets(args.file)
 
     print(f"Starting search from {hex(start_range)} to {hex(end_range)} using {max_workers} threads.")
     start_time = time.time()
@@ -82,10 +148,10 @@ def main():
 
     with open("RIPFOUND.txt", "a") as found_file:
         try:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(targets,)) as executor:
                 futures = []
                 for _ in range(max_workers):
-                    futures.append(executor.submit(kangaroo_worker, start_range, end_range, target_ripemd_list))
+                    futures.append(executor.submit(kangaroo_worker, start_range, end_range))
                 
                 while futures:
                     done, futures = concurrent.futures.wait(futures, timeout=args.seconds, return_when=concurrent.futures.FIRST_COMPLETED)
@@ -97,7 +163,7 @@ def main():
                             found_any = True
 
                     elapsed = time.time() - start_time
-                    keys_checked = max_workers * (elapsed / args.seconds) * 10000
+                    keys_checked = max_workers * (elapsed / args.seconds) * WORKER_ITERATIONS
                     print(f"Elapsed: {elapsed:.2f}s | Keys Checked: {int(keys_checked)} | Speed: {int(keys_checked / elapsed)} keys/s")
         
         except KeyboardInterrupt:
@@ -4,12 +4,17 @@ import time
 import os
 import signal
 import sys
-from Crypto.Hash import RIPEMD160, SHA256
-from coincurve import PrivateKey
+import hashlib
+from coincurve._libsecp256k1 import ffi, lib
+from coincurve.context import GLOBAL_CONTEXT
 import numpy as np
 
 # Constants for secp256k1 curve
-CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+# Target files up to this many digests are loaded into a frozenset; larger ones stay a sorted array
+# of raw 20-byte records (20 bytes per target instead of ~100) searched with np.searchsorted
+HOT_TARGET_LIMIT = 1 << 20
 
 # Signal handler for graceful shutdown
 def signal_handler(sig, frame):
@@ -19,38 +24,78 @@ def signal_handler(sig, frame):
 # Registering signal to handle keyboard interrupts
 signal.signal(signal.SIGINT, signal_handler)
 
-# RIPEMD-160 hashing function using PyCryptodome
-def ripemd160(data):
-    h = RIPEMD160.new()
-    h.update(data)
+# OpenSSL-backed SHA-256, bound once so hash160 skips the module attribute lookup
+sha256 = hashlib.sha256
+
+# Pre-initialized RIPEMD-160 state; copying it skips OpenSSL's per-call digest lookup and setup
+RIPEMD160_INITIAL = hashlib.new('ripemd160')
+
+# HASH160: RIPEMD-160 of the SHA-256 digest of data
+def hash160(data):
+    h = RIPEMD160_INITIAL.copy()
+    h.update(sha256(data).digest())
     return h.digest()
 
+# Target loading function: small files become a frozenset of raw digests, large ones a sorted S20 array
+def load_targets(file_path):
+    # Truncate to a multiple of 20 bytes to match RIPEMD-160 hashes
+    count = os.path.getsize(file_path) // 20
+    if count <= HOT_TARGET_LIMIT:
+        with open(file_path, 'rb') as f:
+            file_content = f.read(count * 20)
+        return frozenset(file_content[i:i + 20] for i in range(0, count * 20, 20))
+    targets = np.fromfile(file_path, dtype='S20', count=count)
+    targets.sort()
+    return targets
+
+# Binary search of the sorted target array; compare raw bytes since S20 elements drop trailing NUL bytes
+def is_target(ripemd_hash, targets):
+    index = targets.searchsorted(ripemd_hash)
+    return index < len(targets) and targets[index:index + 1].tobytes() == ripemd_hash
+
+# Targets of the current worker process, installed once by init_worker
+worker_targets = frozenset()
+
+# Pool initializer: with fork the targets are inherited rather than pickled into every task
+def init_worker(targets):
+    global worker_targets
+    worker_targets = targets
+
 # Kangaroo worker function for parallel processing
-def kangaroo_worker(start_range, end_range, target_ripemd_list):
+def kangaroo_worker(start_range, end_range):
     found_keys = []
-    generated_outputs = []
-    for candidate in range(start_range, end_range):
-        if candidate >= CURVE_ORDER:
-            break
-        try:
-            # Generate private key
-            priv_key = PrivateKey(candidate.to_bytes(32, 'big'))
-            # Derive the public key in compressed format
-            pub_key = priv_key.public_key.format(compressed=True)
-            
-            # Generate RIPEMD-160 hash of the public key
-            sha256_hash = SHA256.new(pub_key).digest()
-            ripemd_hash = ripemd160(sha256_hash)
-            
-            # Save all generated outputs
-            generated_outputs.append(f"{priv_key.to_hex()},{ripemd_hash.hex()}\n")
-            
-            # Check if hash is in target list
-            if ripemd_hash in target_ripemd_list:
-                found_keys.append((priv_key.to_hex(), ripemd_hash.hex()))
-        except Exception as e:
-            print(f"Error with key {hex(candidate)}: {e}")
-    return found_keys, generated_outputs
+    # Pick the membership test once: set lookup for small target lists, binary search for large ones
+    targets = worker_targets
+    if isinstance(targets, frozenset):
+        is_match = targets.__contains__
+    else:
+        is_match = lambda ripemd_hash: is_target(ripemd_hash, targets)
+    # Bind hash160 to a local so each key skips the global lookup
+    hash_160 = hash160
+    # Call libsecp256k1 directly with reused output buffers instead of building PrivateKey/PublicKey objects per key
+    ctx = GLOBAL_CONTEXT.ctx
+    pubkey_create = lib.secp256k1_ec_pubkey_create
+    pubkey_serialize = lib.secp256k1_ec_pubkey_serialize
+    compressed_flag = lib.SECP256K1_EC_COMPRESSED
+    pubkey = ffi.new('secp256k1_pubkey *')
+    pub_out = ffi.new('unsigned char[33]')
+    pub_len = ffi.new('size_t *', 33)
+    pub_key = ffi.buffer(pub_out)
+    # Key 0 and keys at or past the curve order are invalid, so clamp the range instead of raising per key
+    for candidate in range(max(start_range, 1), min(end_range, CURVE_ORDER)):
+        # Generate private key
+        priv_key = candidate.to_bytes(32, 'big')
+        # Derive the public key in compressed format into pub_out
+        pubkey_create(ctx, pubkey, priv_key)
+        pubkey_serialize(ctx, pub_out, pub_len, pubkey, compressed_flag)
+
+        # Generate RIPEMD-160 hash of the public key
+        ripemd_hash = hash_160(pub_key)
+
+        # Check if hash is in target list
+        if is_match(ripemd_hash):
+            found_keys.append((priv_key.hex(), ripemd_hash.hex()))
+    return found_keys
 
 # Main function to handle arguments, file loading, and parallel execution
 def main():
@@ -66,52 +111,47 @@ def main():
     start_range, end_range = map(lambda x: int(x, 16), args.range.split(":"))
     max_workers = min(args.threads, os.cpu_count())
     
-    # Load target RIPEMD-160 hashes from file into a numpy array for efficient lookups
-    with open(args.file, 'rb') as f:
-        file_content = f.read()
-        # Truncate to a multiple of 20 bytes to match RIPEMD-160 hashes
-        adjusted_size = (len(file_content) // 20) * 20
-        target_ripemd_list = np.frombuffer(file_content[:adjusted_size], dtype='S20')
+    # Load target RIPEMD-160 hashes: a frozenset for O(1) lookups, or a sorted array once the file is too large for one
+    targets = load_targets(args.file)
 
     print(f"Starting search from {hex(start_range)} to {hex(end_range)} using {max_workers} threads.")
     start_time = time.time()
     found_any = False
 
-    # Open output files for all generated keys and matches
-    with open("RIPFOUND.txt", "a") as found_file, open("found.txt", "a") as all_file:
-        try:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
-                step_size = (end_range - start_range) // max_workers
-                
-                # Dispatching tasks to each worker
-                for i in range(max_workers):
-                    s = start_range + i * step_size
-                    e = s + step_size if i < max_workers - 1 else end_range
-                    futures.append(executor.submit(kangaroo_worker, s, e, target_ripemd_list))
-                
-                # Monitor results and display progress
-                while futures:
-                    done, futures = concurrent.futures.wait(futures, timeout=args.seconds, return_when=concurrent.futures.FIRST_COMPLETED)
-                    for future in done:
-                        found_keys, generated_outputs = future.result()
-                        
-                        # Write all generated outputs to found.txt
-                        all_file.writelines(generated_outputs)
-                        
-                        # Write matching keys to RIPFOUND.txt
-                        for priv_key, ripemd_hex in found_keys:
-                            print(f"Found matching key: {priv_key} | RIPEMD-160: {ripemd_hex}")
-                            found_file.write(f"{priv_key},{ripemd_hex}\n")
-                            found_any = True
-
-                    elapsed = time.time() - start_time
-                    keys_checked = step_size * max_workers * (elapsed / args.seconds)
-                    print(f"Elapsed: {elapsed:.2f}s | Keys Checked: {int(keys_checked)} | Speed: {int(keys_checked / elapsed)} keys/s")
-        
-        except KeyboardInterrupt:
-            print("\nSearch interrupted by user.")
+    # Open output file for matches as an O_APPEND descriptor so every match is a single write
+    found_fd = os.open("RIPFOUND.txt", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(targets,)) as executor:
+            futures = []
+            step_size = (end_range - start_range) // max_workers
+            
+            # Dispatching tasks to each worker
+            for i in range(max_workers):
+                s = start_range + i * step_size
+                e = s + step_size if i < max_workers - 1 else end_range
+                futures.append(executor.submit(kangaroo_worker, s, e))
+            
+            # Monitor results and display progress
+            while futures:
+                done, futures = concurrent.futures.wait(futures, timeout=args.seconds, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    found_keys = future.result()
+
+                    # Write matching keys to RIPFOUND.txt
+                    for priv_key, ripemd_hex in found_keys:
+                        print(f"Found matching key: {priv_key} | RIPEMD-160: {ripemd_hex}")
+                        os.write(found_fd, f"{priv_key},{ripemd_hex}\n".encode())
+                        found_any = True
+
+                elapsed = time.time() - start_time
+                keys_checked = step_size * max_workers * (elapsed / args.seconds)
+                print(f"Elapsed: {elapsed:.2f}s | Keys Checked: {int(keys_checked)} | Speed: {int(keys_checked / elapsed)} keys/s")
     
+    except KeyboardInterrupt:
+        print("\nSearch interrupted by user.")
+    finally:
+        os.close(found_fd)
+
     # Summary of results
     if not found_any:
         print("No matching keys found.")